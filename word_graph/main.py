@@ -1,83 +1,248 @@
 """
 This application finds the shortest path of words between two words that differ by only one letter.
-It has been implemented in Python, using a breadth-first search (BFS) algorithm.
+It has been implemented in Python, using a bidirectional breadth-first search (BFS) algorithm.
 The script outputs the shortest path to a specified output file.
 """
 
 import argparse
-import json
 import logging
-from typing import List, Set, Optional
+import os
+from collections import defaultdict
+from typing import Dict, FrozenSet, List, Set, Optional, Tuple
 
 
 class WordGraphFinder:
     """
     The WordGraphFinder class reads a file containing a list of words,
     generates all possible next words of a given word by changing one letter at a time,
-    and finds the shortest path between a start word and an end word by performing a BFS.
+    and finds the shortest path between a start word and an end word by performing
+    a bidirectional BFS.
     """
 
-    def __init__(self, words: str, start_word: str, end_word: str, possible_words: dict):
+    def __init__(self, words: str, start_word: str, end_word: str,
+                 patterns: Optional[Dict[str, Tuple[str, ...]]] = None):
         self.words = words
         self.start_word = start_word
         self.end_word = end_word
-        self.possible_words = possible_words
-
-    def get_next_words(self, word: str) -> Set[str]:
+        # wildcard buckets can be built once by the caller and shared between searches
+        self.patterns = self.build_pattern_index(words) if patterns is None else patterns
+        # union-find parents of the connected components, built on the first search
+        self.components: Optional[Dict[str, str]] = None
+        # next words of every word, built by build_adjacency
+        self.adjacency: Optional[Dict[str, FrozenSet[str]]] = None
+
+    def get_next_words(self, word: str) -> FrozenSet[str]:
         """
-        Get all possible next words of a given word from self.possible_words variable.
-        In case all possible next words didn't count before call generate_next_words func
+        Get all possible next words of a given word from self.adjacency variable.
+        In case the adjacency is not built or does not contain the word
+        call generate_next_words func
         Args:
             word: The word to get next words from.
         """
 
-        if word in self.possible_words:
-            return self.words.intersection(self.possible_words[word])
+        if self.adjacency is not None and word in self.adjacency:
+            return self.adjacency[word]
 
         return self.generate_next_words(word)
 
-    def generate_next_words(self, word: str) -> Set[str]:
+    @staticmethod
+    def build_pattern_index(words: Set[str]) -> Dict[str, Tuple[str, ...]]:
+        """
+        Groups the words into wildcard buckets. A bucket key is a word with one letter
+        replaced by "*", so all words in a bucket differ from each other by that letter only.
+        Args:
+            words: Set of words.
+        Returns:
+            A dictionary, where each key is a wildcard pattern and each value is a tuple
+            of all words matching the pattern.
+        """
+
+        patterns = defaultdict(list)
+        for word in words:
+            for i in range(len(word)):
+                patterns[word[:i] + "*" + word[i + 1:]].append(word)
+        # a bucket with a single word still gives a next word to words missing from
+        # the dictionary, so all buckets are kept and frozen to tuples
+        return {pattern: tuple(bucket) for pattern, bucket in patterns.items()}
+
+    def generate_next_words(self, word: str) -> FrozenSet[str]:
         """
         Generates all possible next words of a given word by changing one letter at a time.
-        Add only the words contained in the input file.
-        Save all possible next words to self.possible_words variable.
+        The next words are the union of the wildcard buckets of the given word,
+        so only the words contained in the input file are added.
         Args:
             word: The word to generate next words from.
         Returns:
-            A set containing all possible next words of the given word.
+            A frozenset containing all possible next words of the given word.
+        """
+
+        next_words = set().union(
+            *(self.patterns.get(word[:i] + "*" + word[i + 1:], ()) for i in range(len(word)))
+        )
+        next_words.discard(word)
+        return frozenset(next_words)
+
+    def build_adjacency(self) -> None:
+        """
+        Materializes the next words of every word once, so the searches of a reused finder
+        look them up in self.adjacency instead of computing them.
         """
 
-        next_words = set()
-        possible_words = []
-        for i in range(len(word)):
-            for j in range(ord('a'), ord('z') + 1):
-                next_word = word[:i] + chr(j) + word[i + 1:]
-                possible_words.append(next_word)
-                if next_word in self.words and next_word != word:
-                    next_words.add(next_word)
-        self.possible_words[word] = possible_words
-        return next_words
+        self.adjacency = {word: self.generate_next_words(word) for word in self.words}
 
-    def find_shortest_path(self) -> Optional[List[str]]:
+    @staticmethod
+    def find_component(components: Dict[str, str], word: str) -> str:
         """
-        Finds the shortest path from the start word to the end word by performing a BFS.
+        Finds the root word of the connected component of a given word,
+        compressing the path to the root on the way.
+        Args:
+            components: A dictionary, where each key is a word and each value is
+                its parent in the union-find forest.
+            word: The word to find the component of.
         Returns:
-            A list of words representing the shortest path from the start word to the end word.
+            The root word of the component.
+        """
+
+        while components[word] != word:
+            components[word] = components[components[word]]
+            word = components[word]
+        return word
+
+    def build_components(self) -> Dict[str, str]:
+        """
+        Groups the words into connected components with union-find. All words of
+        a wildcard bucket are connected, so each bucket is merged into one component.
+        Returns:
+            A dictionary, where each key is a word and each value is its parent
+            in the union-find forest.
+        """
+
+        components = {word: word for word in self.words}
+        sizes = dict.fromkeys(self.words, 1)
+        for bucket in self.patterns.values():
+            root = self.find_component(components, bucket[0])
+            for word in bucket[1:]:
+                other = self.find_component(components, word)
+                if other == root:
+                    continue
+                # union by size keeps the trees shallow
+                if sizes[other] > sizes[root]:
+                    root, other = other, root
+                components[other] = root
+                sizes[root] += sizes[other]
+        return components
+
+    def is_connected(self, word: str, other_word: str) -> bool:
+        """
+        Checks whether two words of the dictionary are in the same connected component.
+        Words missing from the dictionary are not checked and reported as connected.
+        Args:
+            word: The first word.
+            other_word: The second word.
+        """
+
+        if self.components is None:
+            self.components = self.build_components()
+        if word not in self.components or other_word not in self.components:
+            return True
+        return (self.find_component(self.components, word)
+                == self.find_component(self.components, other_word))
+
+    @staticmethod
+    def hamming_distance(word: str, other_word: str) -> int:
+        """
+        Counts the positions at which two words of the same length differ.
+        It is a lower bound of the number of steps between the words.
+        Args:
+            word: The first word.
+            other_word: The second word.
+        Returns:
+            The number of differing letters.
+        """
+
+        return sum(letter != other_letter for letter, other_letter in zip(word, other_word))
+
+    @staticmethod
+    def walk_parents(parents: Dict[str, Optional[str]], word: str) -> List[str]:
+        """
+        Walks the parents map from the given word back to the root of the search.
+        Args:
+            parents: A dictionary, where each key is a visited word and each value is
+                the word it was reached from (None for the root).
+            word: The word to start walking from.
+        Returns:
+            A list of words from the given word to the root of the search.
         """
 
-        visited = set([self.start_word])
-        queue = [[self.start_word]]
+        path = []
+        while word is not None:
+            path.append(word)
+            word = parents[word]
+        return path
 
-        while queue:
-            path = queue.pop(0)
-            last_word = path[-1]
+    def find_shortest_path(self, start_word: Optional[str] = None,
+                           end_word: Optional[str] = None) -> Optional[List[str]]:
+        """
+        Finds the shortest path from the start word to the end word by performing
+        a bidirectional BFS. Frontiers grow from both the start word and the end word,
+        the smaller one is expanded level by level, and the search stops as soon as
+        an expanded word reaches a word visited from the other side. Within a level,
+        words are expanded in order of their Hamming distance to the other side's root.
+        Args:
+            start_word: The start word to use instead of self.start_word, so one finder
+                can answer many searches over the same dictionary.
+            end_word: The end word to use instead of self.end_word.
+        Returns:
+            A list of words representing the shortest path from the start word to the end word.
+        """
 
-            if last_word == self.end_word:
-                return path
-            next_words = self.get_next_words(last_word) - visited
-            for next_word in next_words:
-                visited.add(next_word)
-                queue.append(path + [next_word])
+        start_word = self.start_word if start_word is None else start_word
+        end_word = self.end_word if end_word is None else end_word
+
+        if start_word == end_word:
+            return [start_word]
+
+        # words of different length are never connected
+        if len(start_word) != len(end_word):
+            return None
+
+        if not self.is_connected(start_word, end_word):
+            return None
+
+        parents_f = {start_word: None}
+        parents_b = {end_word: None}
+        frontier_f = {start_word}
+        frontier_b = {end_word}
+
+        while frontier_f and frontier_b:
+            # always expand the smaller frontier
+            if len(frontier_f) > len(frontier_b):
+                frontier_f, frontier_b = frontier_b, frontier_f
+                parents_f, parents_b = parents_b, parents_f
+
+            # words closer to the root of the other side are expanded first,
+            # so the meeting point of the last level is found sooner
+            target = end_word if start_word in parents_f else start_word
+            next_frontier = set()
+            for word in sorted(frontier_f, key=lambda w: self.hamming_distance(w, target)):
+                new_words = self.get_next_words(word) - parents_f.keys()
+                parents_f.update(dict.fromkeys(new_words, word))
+
+                # every meeting point found in this level gives a path of the same length,
+                # so the rest of the level does not have to be expanded
+                meet = new_words & parents_b.keys()
+                if meet:
+                    middle = next(iter(meet))
+                    if start_word not in parents_f:
+                        parents_f, parents_b = parents_b, parents_f
+
+                    path = self.walk_parents(parents_f, middle)
+                    path.reverse()
+                    return path + self.walk_parents(parents_b, middle)[1:]
+
+                next_frontier |= new_words
+
+            frontier_f = next_frontier
         return None
 
 
@@ -85,13 +250,9 @@ class WordGraphCli:
     """
     The WordGraphCli class implements the command-line interface
     and parses the command-line arguments using argparse, contains logger,
-    save the shortest path between a start word and an end word to a specified output file
-    also saves all possible next words to  "possible_words.txt" file.
+    save the shortest path between a start word and an end word to a specified output file.
     """
 
-    # name of json file that contains dictionary with all possible next words
-    possible_words_file = "possible_words.json"
-
     def __init__(self):
         """
         This method sets up an argparse ArgumentParser object and adds arguments for the name
@@ -111,34 +272,53 @@ class WordGraphCli:
             "result_file", help="The file name of a text file that will contain the result"
         )
 
-        # self.args = self.parser.parse_args()
+        # words and word graphs of the loaded dictionary files, keyed by file name
+        self.dictionaries: Dict[str, Tuple[int, Dict[int, Set[str]], dict]] = {}
 
     def read_words(self, dictionary_file: str) -> Set[str]:
         """Read words from the specified file and returns them as a set.
+        The file is read at once and split on whitespace, so blank lines are skipped.
         Returns:
             A set containing the words from the file,
             each word converted to lowercase and stripped of any whitespace.
         """
 
-        with open(dictionary_file, "r") as file:
-            words = set(line.strip().lower() for line in file)
-        return words
+        with open(dictionary_file, "rb") as file:
+            data = file.read()
+        return set(data.decode().lower().split())
+
+    def group_by_length(self, words: Set[str]) -> Dict[int, Set[str]]:
+        """
+        Groups the words by their length, only words of the same length can be connected.
+        Args:
+            words: Set of words.
+        Returns:
+            A dictionary, where each key is a word length and each value is a set
+            of all words of that length.
+        """
+
+        words_by_length = defaultdict(set)
+        for word in words:
+            words_by_length[len(word)].add(word)
+        return words_by_length
 
-    def read_possible_words(self) -> dict[list]:
+    def load_dictionary(self, dictionary_file: str) -> Tuple[Dict[int, Set[str]], dict]:
         """
-        Read all possible next words of a given word from json "possible_words.txt" file
-        and returns them as a dict.
+        Loads the words of the specified file grouped by length. The result is reused
+        while the modification time of the file stays the same.
         Returns:
-            A dictionary, where each key is a word and each value is a list
-            of all possible next words of a given word by changing one letter at a time.
+            A tuple of the words grouped by length and a dictionary, where each key is
+            a word length and each value is the WordGraphFinder of the words of that length.
+            The finders are filled in by the caller on the first search of each length.
         """
 
-        try:
-            with open(self.possible_words_file, "r") as file:
-                possible_words = json.load(file)
-        except FileNotFoundError:
-            possible_words = {}
-        return possible_words
+        mtime = os.stat(dictionary_file).st_mtime_ns
+        cached = self.dictionaries.get(str(dictionary_file))
+        if cached is None or cached[0] != mtime:
+            words_by_length = self.group_by_length(self.read_words(dictionary_file))
+            cached = (mtime, words_by_length, {})
+            self.dictionaries[str(dictionary_file)] = cached
+        return cached[1], cached[2]
 
     def save_words(self, path: list[str], result_file: str) -> None:
         """
@@ -151,52 +331,83 @@ class WordGraphCli:
             for word in path:
                 file.write(word + '\n')
 
-    def save_possible_words(self, possible_words: dict[list]) -> None:
+    def run(self) -> Optional[List[str]]:
         """
-        Saves the given dict of possible words to the file specified in the constructor.
-        Args:
-            possible_words (Dict[list]])
+        Runs the word graph program from the command-line arguments.
+
+        This method sets up logging and passes the parsed arguments to run_programmatic.
+        Returns:
+            A list of words representing the shortest path or None.
         """
 
-        with open(self.possible_words_file, "w") as file:
-            json.dump(possible_words, file)
+        args = self.parser.parse_args()
+
+        logging.basicConfig(level=logging.INFO)
 
-    def run(self):
-        """
-        Runs the word graph program.
+        return self.run_programmatic(
+            args.dictionary_file, args.start_word, args.end_word, args.result_file
+        )
 
-        This method sets up logging. It also reads previously saved possible words.
-        Creates a WordGraphFinder object and finds the shortest path between words.
-        Saves the words to the output file and any new possible words.
+    def run_programmatic(self, dictionary_file: str, start_word: str, end_word: str,
+                         result_file: str) -> Optional[List[str]]:
+        """
+        Finds the shortest path between words without parsing command-line arguments,
+        so many pairs of words can be searched in one process.
+
+        The dictionary and the WordGraphFinder of the words of the start word length
+        are loaded once and reused by the next calls with the same dictionary file.
+        All next words of a reused finder are built on its second search.
+        The finder finds the shortest path between words.
+        Saves the words to the output file.
+        Args:
+            dictionary_file: The file name of a text file containing words.
+            start_word: A word contained in the dictionary file.
+            end_word: A word contained in the dictionary file.
+            result_file: The file name of a text file that will contain the result.
+        Returns:
+            A list of words representing the shortest path or None.
         """
 
-        args = self.parser.parse_args()
+        words_by_length, finders_by_length = self.load_dictionary(dictionary_file)
+        start = start_word.lower()
+        end = end_word.lower()
 
-        logging.basicConfig(level=logging.INFO)
+        # only the words of the start word length take part in the search
+        words = words_by_length.get(len(start), set())
+
+        if start not in words:
+            logging.info(f"'{start}' is not contained in the source file.")
+            return None
 
-        words = self.read_words(args.dictionary_file)
-        start_word = args.start_word.lower()
-        end_word = args.end_word.lower()
-        possible_words = self.read_possible_words()
+        if end not in words_by_length.get(len(end), ()):
+            logging.info(f"'{end_word}' is not contained in the source file.")
+            return None
 
-        word_graph = WordGraphFinder(words, start_word, end_word, possible_words)
+        if len(start) != len(end):
+            logging.info(f"'{start_word}' and '{end_word}' have different length, "
+                         f"no path exists. Output file not created")
+            return None
 
-        if start_word not in words:
-            logging.info(f"'{start_word}' is not contained in the source file.")
-            return
+        if start == end:
+            self.save_words([start], result_file)
+            return [start]
 
-        if end_word not in words:
-            logging.info(f"'{args.end_word}' is not contained in the source file.")
-            return
+        # the finder of each length is reused by the next searches, its adjacency is built
+        # only once it is reused, so a single search does not pay for the whole graph
+        word_graph = finders_by_length.get(len(start))
+        if word_graph is None:
+            word_graph = WordGraphFinder(words, start, end)
+            finders_by_length[len(start)] = word_graph
+        elif word_graph.adjacency is None:
+            word_graph.build_adjacency()
 
-        path = word_graph.find_shortest_path()
+        path = word_graph.find_shortest_path(start, end)
         if path:
-            self.save_words(path, args.result_file)
+            self.save_words(path, result_file)
         else:
-            logging.info(f"No path from '{args.start_word}' to '{args.end_word}' found. "
+            logging.info(f"No path from '{start_word}' to '{end_word}' found. "
                          f"Output file not created")
-
-        self.save_possible_words(word_graph.possible_words)
+        return path
 
 
 def main():
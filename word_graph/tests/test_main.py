@@ -18,10 +18,20 @@ from word_graph.main import WordGraphFinder, WordGraphCli
                 {"four", "tire", "tree", "free", "flee", "fore", "tore", "trre"},
                 "fore", "flee", ["fore", "tore", "trre", "tree", "free", "flee"]
         ),
+        (
+                {"four", "tire", "tree", "free", "flee", "fore", "tore", "trre"},
+                "flee", "fore", ["flee", "free", "tree", "trre", "tore", "fore"]
+        ),
+        (
+                {"four", "tire", "tree", "free", "flee", "fore", "tore", "trre"},
+                "tore", "fore", ["tore", "fore"]
+        ),
         (
                 {"four", "tire", "tree", "free", "flee", "fore", "tore", "trre"}, "four", "four",
                 ["four"]),
         ({"four", "tire", "tree", "free", "flee", "fore", "tore", "trre"}, "four", "tree", None),
+        ({"four", "tire", "tree", "trees"}, "tree", "trees", None),
+        ({"tree", "free"}, "trex", "tree", ["trex", "tree"]),
     ],
 )
 def test_find_shortest_path(words, start_word, end_word, expected):
@@ -33,12 +43,123 @@ def test_find_shortest_path(words, start_word, end_word, expected):
         end_word: The end word for the sequence.
         expected: The expected result of the sequence.
     """
-    finder = WordGraphFinder(words, start_word, end_word, {})
+    finder = WordGraphFinder(words, start_word, end_word)
     actual = finder.find_shortest_path()
 
     assert actual == expected
 
 
+def test_find_shortest_path_stops_at_first_meeting():
+    """
+    Test that find_shortest_path stops expanding a level once the frontiers meet.
+    """
+
+    graph = {
+        "s0": {"a1", "a2"},
+        "a1": {"s0", "b1", "b2", "b3"},
+        "a2": {"s0", "b1", "b2", "b3"},
+        "b1": {"a1", "a2", "e0"},
+        "b2": {"a1", "a2", "e0"},
+        "b3": {"a1", "a2", "e0"},
+        "e0": {"b1", "b2", "b3"},
+    }
+    finder = WordGraphFinder(set(graph), "s0", "e0")
+    with mock.patch.object(finder, "get_next_words", side_effect=graph.__getitem__) as next_words:
+        actual = finder.find_shortest_path()
+
+    assert len(actual) == 4
+    assert actual[0] == "s0" and actual[-1] == "e0"
+    # "s0", "e0" and only one of "a1" and "a2" are expanded
+    assert next_words.call_count == 3
+
+
+def test_build_adjacency():
+    """
+    Test that after build_adjacency a reused finder only looks up the next words.
+    """
+
+    words = {"four", "tire", "tree", "free", "flee", "fore", "tore", "trre"}
+    finder = WordGraphFinder(words, "fore", "tree")
+    finder.build_adjacency()
+
+    assert finder.adjacency["trre"] == {"tore", "tree", "tire"}
+    assert finder.adjacency["four"] == set()
+    with mock.patch.object(finder, "generate_next_words") as generate_next_words:
+        assert finder.find_shortest_path() == ["fore", "tore", "trre", "tree"]
+        assert finder.find_shortest_path("tree", "flee") == ["tree", "free", "flee"]
+    generate_next_words.assert_not_called()
+
+
+def test_build_adjacency_word_not_in_dictionary():
+    """
+    Test that a finder with adjacency still searches from and to a word missing
+    from the dictionary.
+    """
+
+    finder = WordGraphFinder({"tree", "free"}, "tree", "free")
+    finder.build_adjacency()
+
+    assert finder.find_shortest_path("xree", "free") == ["xree", "free"]
+    assert finder.find_shortest_path("trex", "tree") == ["trex", "tree"]
+    assert finder.find_shortest_path("trex", "free") == ["trex", "tree", "free"]
+
+
+@pytest.mark.parametrize("word, other_word, expected", [
+    ("fore", "flee", True),
+    ("tire", "tree", True),
+    ("four", "tree", False),
+    ("tree", "word", True),
+])
+def test_is_connected(word, other_word, expected):
+    """
+    Test the is_connected method of the WordGraphFinder class.
+    Args:
+        word: The first word.
+        other_word: The second word.
+        expected: The expected result of the check.
+    """
+
+    words = {"four", "tire", "tree", "free", "flee", "fore", "tore", "trre"}
+    finder = WordGraphFinder(words, word, other_word)
+
+    assert finder.is_connected(word, other_word) == expected
+
+
+@pytest.mark.parametrize("word, other_word, expected", [
+    ("tree", "tree", 0),
+    ("tree", "trre", 1),
+    ("fore", "flee", 2),
+])
+def test_hamming_distance(word, other_word, expected):
+    """
+    Test the hamming_distance method of the WordGraphFinder class.
+    Args:
+        word: The first word.
+        other_word: The second word.
+        expected: The expected number of differing letters.
+    """
+
+    assert WordGraphFinder.hamming_distance(word, other_word) == expected
+
+
+@pytest.mark.parametrize("parents, word, expected", [
+    ({"fore": None, "tore": "fore", "trre": "tore"}, "trre", ["trre", "tore", "fore"]),
+    ({"fore": None, "tore": "fore", "trre": "tore"}, "fore", ["fore"]),
+])
+def test_walk_parents(parents, word, expected):
+    """
+    Test the walk_parents method of the WordGraphFinder class.
+    Args:
+        parents: Parents map built by the search.
+        word: The word to start walking from.
+        expected: The expected result of the sequence.
+    """
+
+    actual = WordGraphFinder.walk_parents(parents, word)
+
+    assert actual == expected
+
+
 @pytest.mark.parametrize("words, word, expected", [
     ({"four", "tire", "tree", "free", "flee", "fore", "tore", "trre"}, "tree", {"trre", "free"}),
     ({"four", "tire", "tree", "free", "flee", "fore", "tore", "trre"}, "trre",
@@ -54,42 +175,38 @@ def test_generate_next_words(words, word, expected):
         expected: The expected result of the sequence.
     """
 
-    finder = WordGraphFinder(words, "word", "word", {})
+    finder = WordGraphFinder(words, "word", "word")
     actual = finder.generate_next_words(word)
 
     assert actual == expected
 
 
-@pytest.mark.parametrize('words, word, possible_words, expected', [
-    (
-            {"four", "tire", "tree", "free", "flee", "fore", "tore", "trre"}, "tree",
-            {"tree": [
-                "aree", "bree", "cree", "dree", "eree", "free", "gree", "hree", "iree", "jree",
-                "kree", "lree", "mree", "nree", "oree", "pree", "qree", "rree", "sree", "tree",
-                "uree", "vree", "wree", "xree", "yree", "zree", "taee", "tbee", "tcee", "tdee",
-                "teee", "tfee", "tgee", "thee", "tiee", "tjee", "tkee", "tlee", "tmee", "tnee",
-                "toee", "tpee", "tqee", "tree", "tsee", "ttee", "tuee", "tvee", "twee", "txee",
-                "tyee", "tzee", "trae", "trbe", "trce", "trde", "tree", "trfe", "trge", "trhe",
-                "trie", "trje", "trke", "trle", "trme", "trne", "troe", "trpe", "trqe", "trre",
-                "trse", "trte", "true", "trve", "trwe", "trxe", "trye", "trze", "trea", "treb",
-                "trec", "tred", "tree", "tref", "treg", "treh", "trei", "trej", "trek", "trel",
-                "trem", "tren", "treo", "trep", "treq", "trer", "tres", "tret", "treu", "trev",
-                "trew", "trex", "trey", "trez"]},
-            {"trre", "free"}
-    )
+def test_build_pattern_index():
+    """Test the build_pattern_index method of the WordGraphFinder class."""
+
+    actual = WordGraphFinder.build_pattern_index({"tree", "free", "trre"})
+
+    assert {key: sorted(value) for key, value in actual.items()} == {
+        "*ree": ["free", "tree"], "t*ee": ["tree"], "tr*e": ["tree", "trre"], "tre*": ["tree"],
+        "f*ee": ["free"], "fr*e": ["free"], "fre*": ["free"],
+        "*rre": ["trre"], "t*re": ["trre"], "trr*": ["trre"],
+    }
+
+
+@pytest.mark.parametrize("words, word, expected", [
+    ({"four", "tire", "tree", "free", "flee", "fore", "tore", "trre"}, "tree", {"trre", "free"}),
 ])
-def test_get_next_words(words, word, possible_words, expected):
+def test_get_next_words(words, word, expected):
     """
     Test the get_next_words method of the WordGraphFinder class.
     Args:
         words: Set of words.
         word: The word to generate next words from.
-        possible_words: All possible next words of a given word by changing one letter at a time
         expected: The expected result of the sequence.
     """
 
-    finder = WordGraphFinder(words, "word", "word", possible_words)
-    actual = finder.generate_next_words(word)
+    finder = WordGraphFinder(words, "word", "word")
+    actual = finder.get_next_words(word)
 
     assert actual == expected
 
@@ -104,7 +221,7 @@ def words_file(tmp_path) -> str:
         str: The path to the temporary file.
     """
     # Define the content of the file
-    content = "four\ntire\ntree\nfree\nflee\nfore\ntore\ntrre\n"
+    content = "four\ntire\nTree\nfree \nflee\n\nfore\ntore\r\ntrre\n"
 
     # Write the content to a temporary file
     file_path = tmp_path / "words.txt"
@@ -131,9 +248,21 @@ def test_read_words(words_file, cli):
     assert words == {"four", "tire", "tree", "free", "flee", "fore", "tore", "trre"}
 
 
+def test_group_by_length(cli):
+    """
+    Test that the group_by_length function groups the words by their length.
+    Args:
+        cli (WordGraphCli): An instance of the WordGraphCli class.
+    """
+
+    words_by_length = cli.group_by_length({"four", "tree", "trees", "a"})
+
+    assert words_by_length == {1: {"a"}, 4: {"four", "tree"}, 5: {"trees"}}
+
+
 @mock.patch('argparse.ArgumentParser.parse_args',
             return_value=argparse.Namespace(dictionary_file="dict_file.txt", start_word="start_word",
-                                            end_word="end", kwarg4="output.txt"))
+                                            end_word="end", result_file="output.txt"))
 def test_start_word_in_file(mock_args, caplog, cli):
     """
     Test that the run method logs an error message when the start word is not in the source file.
@@ -151,7 +280,7 @@ def test_start_word_in_file(mock_args, caplog, cli):
 
 @mock.patch('argparse.ArgumentParser.parse_args',
             return_value=argparse.Namespace(dictionary_file="dict_file.txt", start_word="Spin",
-                                            end_word="end_word", kwarg4="output.txt"))
+                                            end_word="end_word", result_file="output.txt"))
 def test_end_word_in_file(mock_args, caplog, cli):
     """
     Test that the run method logs an error message when the end word is not in the source file.
@@ -169,7 +298,7 @@ def test_end_word_in_file(mock_args, caplog, cli):
 
 @mock.patch('argparse.ArgumentParser.parse_args',
             return_value=argparse.Namespace(dictionary_file="dict_file.txt", start_word="Spin",
-                                            end_word="Tree", kwarg4="output.txt"))
+                                            end_word="Tree", result_file="output.txt"))
 def test_no_path(mock_args, caplog, cli):
     """
     Test that the run method logs an error message when there is no path
@@ -184,3 +313,94 @@ def test_no_path(mock_args, caplog, cli):
         cli.run()
 
     assert "No path from 'Spin' to 'Tree' found. " in caplog.text
+
+
+def test_different_length(caplog, cli, tmp_path):
+    """
+    Test that the run method logs a message without searching when the start and end words
+    have different length.
+    Args:
+        caplog (pytest.LogCaptureFixture): A fixture provided by pytest to capture log messages.
+        cli (WordGraphCli): An instance of the WordGraphCli class.
+        tmp_path: A pytest built-in fixture that provides a temporary path.
+    """
+
+    dictionary_file = tmp_path / "words.txt"
+    dictionary_file.write_text("tree\ntrees\n")
+    result_file = tmp_path / "result.txt"
+    args = argparse.Namespace(dictionary_file=dictionary_file, start_word="Tree",
+                              end_word="Trees", result_file=result_file)
+
+    with mock.patch('argparse.ArgumentParser.parse_args', return_value=args):
+        with mock.patch.object(WordGraphFinder, "find_shortest_path") as find_shortest_path:
+            with caplog.at_level(logging.INFO):
+                cli.run()
+
+    find_shortest_path.assert_not_called()
+    assert "'Tree' and 'Trees' have different length" in caplog.text
+    assert not result_file.exists()
+
+
+def test_same_start_and_end_word(words_file, cli, tmp_path):
+    """
+    Test that the run method saves the start word when it is equal to the end word.
+    Args:
+        words_file (str): Temp path to the file containing the words.
+        cli (WordGraphCli): An instance of the WordGraphCli class.
+        tmp_path: A pytest built-in fixture that provides a temporary path.
+    """
+
+    result_file = tmp_path / "result.txt"
+    args = argparse.Namespace(dictionary_file=words_file, start_word="Tree",
+                              end_word="tree", result_file=result_file)
+
+    with mock.patch('argparse.ArgumentParser.parse_args', return_value=args):
+        cli.run()
+
+    assert result_file.read_text() == "tree\n"
+
+
+def test_run_programmatic_reuses_dictionary(words_file, cli, tmp_path):
+    """
+    Test that run_programmatic loads the dictionary and builds its graph once
+    for several searches.
+    Args:
+        words_file (str): Temp path to the file containing the words.
+        cli (WordGraphCli): An instance of the WordGraphCli class.
+        tmp_path: A pytest built-in fixture that provides a temporary path.
+    """
+
+    result_file = tmp_path / "result.txt"
+
+    with mock.patch.object(cli, "read_words", wraps=cli.read_words) as read_words, \
+            mock.patch.object(WordGraphFinder, "build_adjacency", autospec=True,
+                              side_effect=WordGraphFinder.build_adjacency) as build_adjacency:
+        first = cli.run_programmatic(words_file, "Fore", "Tree", result_file)
+        second = cli.run_programmatic(words_file, "tree", "flee", result_file)
+
+    assert first == ["fore", "tore", "trre", "tree"]
+    assert second == ["tree", "free", "flee"]
+    assert result_file.read_text() == "tree\nfree\nflee\n"
+    read_words.assert_called_once()
+    build_adjacency.assert_called_once()
+
+
+def test_single_run_does_not_build_adjacency(words_file, cli, tmp_path):
+    """
+    Test that a single search of the run method does not build the whole adjacency.
+    Args:
+        words_file (str): Temp path to the file containing the words.
+        cli (WordGraphCli): An instance of the WordGraphCli class.
+        tmp_path: A pytest built-in fixture that provides a temporary path.
+    """
+
+    result_file = tmp_path / "result.txt"
+    args = argparse.Namespace(dictionary_file=words_file, start_word="Fore",
+                              end_word="Tree", result_file=result_file)
+
+    with mock.patch('argparse.ArgumentParser.parse_args', return_value=args), \
+            mock.patch.object(WordGraphFinder, "build_adjacency") as build_adjacency:
+        path = cli.run()
+
+    assert path == ["fore", "tore", "trre", "tree"]
+    build_adjacency.assert_not_called()